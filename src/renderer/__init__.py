@@ -1,3 +1,3 @@
-from .engine import ProRenderer
+from .engine import ProRenderer, RendererError
 
-__all__ = ["ProRenderer"]
+__all__ = ["ProRenderer", "RendererError"]
@@ -1,12 +1,13 @@
 """Main rendering engine - dispatches to type-specific renderers."""
 
+import io
 import time
 from pathlib import Path
 
 from PIL import Image
 
 from ..models.infographic import InfographicData, InfographicType
-from .themes import get_theme
+from .themes import QUALITY_LEVELS, get_theme
 
 from .renderers.architecture import render_architecture
 from .renderers.flowchart import render_flowchart
@@ -32,6 +33,14 @@ RENDERERS = {
     InfographicType.RAG_PIPELINE: render_rag_pipeline,
 }
 
+# Renderers that accept ``quality="draft"``; the others always draw at
+# normal quality and ignore the setting
+DRAFT_RENDERERS = {render_rag_pipeline}
+
+
+class RendererError(RuntimeError):
+    """A type-specific renderer failed while drawing an infographic."""
+
 
 class ProRenderer:
     """Professional infographic renderer.
@@ -43,12 +52,27 @@ class ProRenderer:
         self.theme = get_theme(theme_name)
         self.theme_name = theme_name
 
+    def _draw(
+        self, data: InfographicData, width: int, height: int, quality: str = "normal",
+    ) -> Image.Image:
+        if quality not in QUALITY_LEVELS:
+            raise ValueError(f"Unknown quality {quality!r}, expected one of {QUALITY_LEVELS}")
+        renderer_fn = RENDERERS.get(data.type, render_infographic)
+        kwargs = {"quality": quality} if renderer_fn in DRAFT_RENDERERS else {}
+        try:
+            return renderer_fn(data, width, height, self.theme, **kwargs)
+        except Exception as e:
+            raise RendererError(
+                f"{data.type.value} renderer failed with theme {self.theme_name!r}: {e}"
+            ) from e
+
     def render(
         self,
         data: InfographicData,
         width: int = 1400,
         height: int = 900,
         output_path: str | None = None,
+        quality: str = "normal",
     ) -> Path:
         """Render an infographic to PNG.
 
@@ -57,15 +81,20 @@ class ProRenderer:
             width: Output width in pixels.
             height: Output height in pixels.
             output_path: Where to save. Auto-generated if None.
+            quality: "normal" or "draft". Draft skips decorative strokes
+                for previews; types without a draft mode ignore it, and
+                it only saves time with dark themes.
 
         Returns:
             Path to the saved PNG file.
+
+        Raises:
+            ValueError: If ``quality`` is not a known level.
+            RendererError: If the type-specific renderer fails.
         """
-        renderer_fn = RENDERERS.get(data.type, render_infographic)
-        img = renderer_fn(data, width, height, self.theme)
+        img = self._draw(data, width, height, quality)
 
         if output_path is None:
-            Path("output").mkdir(exist_ok=True)
             output_path = f"output/pro_{int(time.time())}.png"
 
         path = Path(output_path)
@@ -73,12 +102,31 @@ class ProRenderer:
         img.save(str(path), "PNG", quality=95)
         return path
 
+    def render_to_bytes(
+        self,
+        data: InfographicData,
+        width: int = 1400,
+        height: int = 900,
+        compress_level: int = 6,
+        quality: str = "normal",
+    ) -> bytes:
+        """Render and return the encoded PNG, leaving the write to the caller.
+
+        ``compress_level`` is the zlib level (0-9). Encoding is a large share
+        of the render time, so throwaway outputs can trade size for speed
+        with a low level. ``quality`` is passed on as in :meth:`render`.
+        """
+        img = self._draw(data, width, height, quality)
+        buf = io.BytesIO()
+        img.save(buf, "PNG", quality=95, compress_level=compress_level)
+        return buf.getvalue()
+
     def render_to_image(
         self,
         data: InfographicData,
         width: int = 1400,
         height: int = 900,
+        quality: str = "normal",
     ) -> Image.Image:
         """Render and return the PIL Image (no file save)."""
-        renderer_fn = RENDERERS.get(data.type, render_infographic)
-        return renderer_fn(data, width, height, self.theme)
+        return self._draw(data, width, height, quality)
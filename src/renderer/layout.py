@@ -5,6 +5,8 @@ so cards with more text are taller and cards with no text stay compact.
 """
 
 import math
+from dataclasses import dataclass
+
 from PIL import Image, ImageDraw
 
 from .typography import get_font, text_size, wrap_text
@@ -110,6 +112,55 @@ def measure_content_heights(
 # Layout functions
 # ---------------------------------------------------------------------------
 
+@dataclass
+class LayoutTable:
+    """Node geometry for one row, stored column-wise (index i = i-th node).
+
+    ``arrow_starts``/``arrow_ends`` hold the x range of the arrow from
+    node i to node i + 1, so they have one entry fewer than ``xs``.
+    """
+
+    xs: list[int]
+    ys: list[int]
+    ws: list[int]
+    hs: list[int]
+    colors: list[str]
+    arrow_starts: list[int]
+    arrow_ends: list[int]
+
+    def bbox(self, i: int) -> tuple[int, int, int, int]:
+        x, y = self.xs[i], self.ys[i]
+        return (x, y, x + self.ws[i], y + self.hs[i])
+
+
+def layout_row(
+    colors: list[str],
+    left: int,
+    top: int,
+    stage_w: int,
+    stage_h: int,
+    arrow_gap: int,
+) -> LayoutTable:
+    """Left-to-right row of equal stages separated by arrow gaps.
+
+    One stage per entry in ``colors``; all coordinates are computed up
+    front so renderers only index into the table.
+    """
+    n = len(colors)
+    step = stage_w + arrow_gap
+    xs = [left + i * step for i in range(n)]
+    arrow_starts = [x + stage_w + 5 for x in xs[:-1]]
+    return LayoutTable(
+        xs=xs,
+        ys=[top] * n,
+        ws=[stage_w] * n,
+        hs=[stage_h] * n,
+        colors=list(colors),
+        arrow_starts=arrow_starts,
+        arrow_ends=[a + arrow_gap - 10 for a in arrow_starts],
+    )
+
+
 def layout_layered(
     layers: list[dict],
     nodes: list[dict],
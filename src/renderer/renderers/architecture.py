@@ -62,7 +62,7 @@ def _render_guidebook(
 
     # Subtle outer border (thinner than whiteboard)
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=12, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=12, border_width=1, img=img)
 
     margin = 50
     header_h = 80
@@ -265,6 +265,7 @@ def _render_guidebook(
                     draw, (mid_x + off_x - 9, mid_y + off_y - 9),
                     ci + 1, bg_color="#FFFFFF", border_color=conn_color,
                     text_color=conn_color, radius=9,
+                    img=img,
                 )
             else:
                 # Very short: just the arrow
@@ -295,7 +296,7 @@ def _render_whiteboard(
 
     # Outer dashed border
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     margin = 50
     header_h = 90
@@ -382,6 +383,7 @@ def _render_whiteboard(
                 text_color=sc["text"],
                 dashed=True,
                 border_width=2,
+                img=img,
             )
 
     # Node styling for whiteboard
@@ -502,6 +504,7 @@ def _render_whiteboard(
                     border_color=conn_color,
                     text_color=conn_color,
                     radius=13,
+                    img=img,
                 )
                 if conn.label:
                     label_font = get_font(10, "semibold")
@@ -536,6 +539,7 @@ def _render_whiteboard(
                     border_color=conn_color,
                     text_color=conn_color,
                     radius=10,
+                    img=img,
                 )
             # Very short arrows (< 60px): no step number at all to avoid clutter
 
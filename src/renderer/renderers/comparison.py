@@ -50,7 +50,7 @@ def _render_guidebook(
 
     # Soft outer border
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1, img=img)
 
     margin = 50
     header_h = 80
@@ -231,7 +231,7 @@ def _render_whiteboard(
 
     # Outer dashed border
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     margin = 50
     header_h = 90
@@ -301,6 +301,7 @@ def _render_whiteboard(
             text_color=sc["text"],
             dashed=True,
             border_width=2,
+            img=img,
         )
 
         # Render items in column — content-adaptive heights
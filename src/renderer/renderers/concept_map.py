@@ -50,7 +50,7 @@ def _render_guidebook(
 
     # Soft outer border
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1, img=img)
 
     header_h = 80
 
@@ -179,7 +179,7 @@ def _render_whiteboard(
 
     # Outer dashed border
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     header_h = 90
 
@@ -55,7 +55,7 @@ def _render_guidebook(
 
     # Subtle outer border
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=12, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=12, border_width=1, img=img)
 
     margin = 50
     header_h = 80
@@ -183,7 +183,7 @@ def _render_whiteboard(
 
     # Outer dashed border
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     margin = 50
     header_h = 90
@@ -284,6 +284,7 @@ def _render_whiteboard(
             border_color=sc["border"],
             text_color=sc["border"],
             radius=15,
+            img=img,
         )
 
         # Node with white fill and colored border
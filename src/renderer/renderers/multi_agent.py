@@ -55,7 +55,7 @@ def _render_guidebook(
     draw = ImageDraw.Draw(img)
 
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1, img=img)
 
     header_h = 80
 
@@ -172,7 +172,7 @@ def _render_whiteboard(
     draw = ImageDraw.Draw(img)
 
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     header_h = 90
 
@@ -50,7 +50,7 @@ def _render_guidebook(
 
     # Soft outer border
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1, img=img)
 
     margin = 50
     header_h = 80
@@ -163,6 +163,7 @@ def _render_guidebook(
                     i + 1, bg_color="#FFFFFF",
                     border_color=sc["border"],
                     text_color=sc["border"], radius=9,
+                    img=img,
                 )
 
     # Footer
@@ -190,7 +191,7 @@ def _render_whiteboard(
 
     # Outer dashed border
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     margin = 50
     header_h = 90
@@ -282,6 +283,7 @@ def _render_whiteboard(
             text_color=sc["text"],
             dashed=True,
             border_width=2,
+            img=img,
         )
 
         # Icon centered in the top area — prominent with colored background
@@ -379,6 +381,7 @@ def _render_whiteboard(
                 border_color=sc["border"],
                 text_color=sc["border"],
                 radius=12,
+                img=img,
             )
             if conn_label:
                 lbl_font = get_font(9, "semibold")
@@ -50,7 +50,7 @@ def _render_guidebook(
 
     # Soft outer border
     outer_color = theme.get("outer_border_color", "#5B8DEF")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=1, img=img)
 
     margin = 50
     header_h = 80
@@ -152,6 +152,7 @@ def _render_guidebook(
             bg_color="#FFFFFF",
             text_color=sc["border"],
             size=18,
+            img=img,
         )
 
     # Footer
@@ -179,7 +180,7 @@ def _render_whiteboard(
 
     # Outer dashed border
     outer_color = theme.get("outer_border_color", "#2B7DE9")
-    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2)
+    draw_outer_border(draw, width, height, outer_color, margin=15, border_width=2, img=img)
 
     margin = 50
     header_h = 90
@@ -280,6 +281,7 @@ def _render_whiteboard(
             border_color=sc["border"],
             text_color=sc["border"],
             radius=18,
+            img=img,
         )
 
         # Icon in top-right with background (SwirlAI style)
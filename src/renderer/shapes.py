@@ -1,14 +1,22 @@
 """Shape rendering for infographic nodes."""
 
 import math
+from functools import lru_cache
 
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageFont
 
 from .themes import hex_to_rgb, hex_to_rgba
 from .icons import paste_icon
 from .typography import get_font, text_size, draw_text_block
 
 
+# Unit vectors to the 6 vertices of a pointy-top hexagon (fixed angles)
+_HEX_UNIT = tuple(
+    (math.cos(math.pi / 6 + i * math.pi / 3), math.sin(math.pi / 6 + i * math.pi / 3))
+    for i in range(6)
+)
+
+
 def draw_rounded_rect(
     draw: ImageDraw.Draw,
     bbox: tuple[int, int, int, int],
@@ -76,9 +84,11 @@ def draw_cylinder(
     # Side lines
     draw.line([(x0, y0 + ellipse_h // 2), (x0, y1 - ellipse_h // 2)], fill=outline_rgb, width=1)
     draw.line([(x1, y0 + ellipse_h // 2), (x1, y1 - ellipse_h // 2)], fill=outline_rgb, width=1)
-    # Top ellipse highlight (lighter shade)
-    lighter = tuple(min(c + 30, 255) for c in fill_rgb)
-    draw.ellipse((x0 + 2, y0 + 2, x1 - 2, y0 + ellipse_h - 2), fill=lighter)
+    # Top ellipse highlight (lighter shade) — on small cylinders it would
+    # cover the whole top, or be an invalid box
+    if ellipse_h >= 8 and (x1 - x0) >= 20:
+        lighter = tuple(min(c + 30, 255) for c in fill_rgb)
+        draw.ellipse((x0 + 2, y0 + 2, x1 - 2, y0 + ellipse_h - 2), fill=lighter)
 
 
 def draw_hexagon(
@@ -89,12 +99,7 @@ def draw_hexagon(
     outline: str | None = None,
 ) -> None:
     cx, cy = center
-    points = []
-    for i in range(6):
-        angle = math.pi / 6 + i * math.pi / 3
-        px = cx + int(radius * math.cos(angle))
-        py = cy + int(radius * math.sin(angle))
-        points.append((px, py))
+    points = [(cx + int(radius * ux), cy + int(radius * uy)) for ux, uy in _HEX_UNIT]
     draw.polygon(points, fill=hex_to_rgb(fill), outline=hex_to_rgb(outline) if outline else None)
 
 
@@ -121,18 +126,65 @@ def draw_cloud(
     draw.ellipse((x0 + w * 0.45, y0 + h * 0.05, x0 + w * 0.8, cy + h * 0.1), fill=fill_rgb)
 
 
-def draw_dashed_rect(
+@lru_cache(maxsize=64)
+def _corner_sprite(
+    radius: int,
+    width: int,
+    dash: int,
+    gap: int,
+    transpose: Image.Transpose | None = None,
+) -> Image.Image:
+    """Dashed quarter-circle "L" mask for the top-left corner of a dashed rect.
+
+    Dashes are centered on the corner so the sprite is symmetric and the
+    other three corners are plain flips of it.
+    """
+    r = radius
+    arc_len = math.pi * r / 2
+    n = max(1, round((arc_len + gap) / (dash + gap)))
+    pattern = n * dash + (n - 1) * gap
+    sprite = Image.new("L", (2 * r + 1, 2 * r + 1), 0)
+    sprite_draw = ImageDraw.Draw(sprite)
+    if pattern >= arc_len:
+        sprite_draw.arc((0, 0, 2 * r, 2 * r), 180, 270, fill=255, width=width)
+    else:
+        deg_per_px = 90 / arc_len
+        pos = (arc_len - pattern) / 2
+        for _ in range(n):
+            start = 180 + pos * deg_per_px
+            sprite_draw.arc((0, 0, 2 * r, 2 * r), start, start + dash * deg_per_px, fill=255, width=width)
+            pos += dash + gap
+    sprite = sprite.crop((0, 0, r + 1, r + 1))
+    return sprite.transpose(transpose) if transpose is not None else sprite
+
+
+def _dash_axis(
+    sx: int, sy: int, ex: int, ey: int, dash: int, gap: int,
+) -> list[tuple[int, int, int, int]]:
+    """Split a horizontal or vertical line into (x0, y0, x1, y1) dashes."""
+    if sy == ey:
+        length, sign = abs(ex - sx), (1 if ex >= sx else -1)
+        return [
+            (sx + sign * pos, sy, sx + sign * min(pos + dash, length), sy)
+            for pos in range(0, length, dash + gap)
+        ]
+    length, sign = abs(ey - sy), (1 if ey >= sy else -1)
+    return [
+        (sx, sy + sign * pos, sx, sy + sign * min(pos + dash, length))
+        for pos in range(0, length, dash + gap)
+    ]
+
+
+def _draw_dashed_outline(
     draw: ImageDraw.Draw,
     bbox: tuple[int, int, int, int],
-    color: str,
-    width: int = 2,
-    dash: int = 10,
-    gap: int = 6,
-    radius: int = 8,
+    fill,
+    width: int,
+    dash: int,
+    gap: int,
+    radius: int,
 ) -> None:
-    """Draw a dashed rounded rectangle (SwirlAI style section borders)."""
     x0, y0, x1, y1 = bbox
-    color_rgb = hex_to_rgb(color)
     r = min(radius, (x1 - x0) // 2, (y1 - y0) // 2)
 
     # Draw 4 dashed edges (simplified: skip corners for now)
@@ -142,31 +194,84 @@ def draw_dashed_rect(
         ((x1 - r, y1), (x0 + r, y1)),  # bottom
         ((x0, y1 - r), (x0, y0 + r)),  # left
     ]
-    for start, end in edges:
-        sx, sy = start
-        ex, ey = end
-        dx, dy = ex - sx, ey - sy
-        length = math.sqrt(dx * dx + dy * dy)
-        if length < 1:
-            continue
-        ux, uy = dx / length, dy / length
-        pos = 0.0
-        while pos < length:
-            s = (int(sx + ux * pos), int(sy + uy * pos))
-            e_pos = min(pos + dash, length)
-            e = (int(sx + ux * e_pos), int(sy + uy * e_pos))
-            draw.line([s, e], fill=color_rgb, width=width)
-            pos += dash + gap
+    segments = [seg for (sx, sy), (ex, ey) in edges for seg in _dash_axis(sx, sy, ex, ey, dash, gap)]
+    line = draw.line
+    for seg in segments:
+        line(seg, fill=fill, width=width)
+
+    # Dashed corner arcs, stamped from one cached quarter-circle sprite
+    if r > 0:
+        corners = [
+            ((x1 - r, y0), Image.Transpose.FLIP_LEFT_RIGHT),  # top-right
+            ((x1 - r, y1 - r), Image.Transpose.ROTATE_180),   # bottom-right
+            ((x0, y1 - r), Image.Transpose.FLIP_TOP_BOTTOM),  # bottom-left
+            ((x0, y0), None),                                 # top-left
+        ]
+        for pos, transpose in corners:
+            draw.bitmap(pos, _corner_sprite(r, width, dash, gap, transpose), fill=fill)
+
+
+@lru_cache(maxsize=64)
+def _dashed_mask(
+    w: int,
+    h: int,
+    dash: int,
+    gap: int,
+    radius: int,
+    border_width: int,
+) -> tuple[tuple[tuple[int, int], Image.Image], ...]:
+    """Rasterize a dashed rounded border once, as (offset, "L" mask) strips.
 
-    # Draw corner arcs as small curved sections
-    corners = [
-        ((x1 - 2 * r, y0, x1, y0 + 2 * r), 270, 360),      # top-right
-        ((x1 - 2 * r, y1 - 2 * r, x1, y1), 0, 90),          # bottom-right
-        ((x0, y1 - 2 * r, x0 + 2 * r, y1), 90, 180),        # bottom-left
-        ((x0, y0, x0 + 2 * r, y0 + 2 * r), 180, 270),       # top-left
+    The mask is padded by ``border_width`` on each side. Only the strips
+    along the four edges are kept so pasting touches the border ring
+    instead of the whole (mostly empty) box.
+    """
+    pad = border_width
+    mask = Image.new("L", (w + 1 + 2 * pad, h + 1 + 2 * pad), 0)
+    _draw_dashed_outline(ImageDraw.Draw(mask), (pad, pad, pad + w, pad + h), 255, border_width, dash, gap, radius)
+
+    mw, mh = mask.size
+    t = min(radius, w // 2, h // 2) + 2 * pad + 1
+    if 2 * t >= min(mw, mh):
+        return (((0, 0), mask),)
+    strips = [
+        (0, 0, mw, t),            # top
+        (0, mh - t, mw, mh),      # bottom
+        (0, t, t, mh - t),        # left
+        (mw - t, t, mw, mh - t),  # right
     ]
-    for arc_bbox, start_angle, end_angle in corners:
-        draw.arc(arc_bbox, start_angle, end_angle, fill=color_rgb, width=width)
+    return tuple(((box[0], box[1]), mask.crop(box)) for box in strips)
+
+
+def paste_dashed_rect(
+    img: Image.Image,
+    bbox: tuple[int, int, int, int],
+    color: str,
+    width: int = 2,
+    dash: int = 10,
+    gap: int = 6,
+    radius: int = 8,
+) -> None:
+    """Same output as draw_dashed_rect, pasted from a cached border mask."""
+    x0, y0, x1, y1 = bbox
+    color_rgb = hex_to_rgb(color)
+    ox, oy = x0 - width, y0 - width
+    for (sx, sy), strip in _dashed_mask(x1 - x0, y1 - y0, dash, gap, radius, width):
+        px, py = ox + sx, oy + sy
+        img.paste(color_rgb, (px, py, px + strip.width, py + strip.height), strip)
+
+
+def draw_dashed_rect(
+    draw: ImageDraw.Draw,
+    bbox: tuple[int, int, int, int],
+    color: str,
+    width: int = 2,
+    dash: int = 10,
+    gap: int = 6,
+    radius: int = 8,
+) -> None:
+    """Draw a dashed rounded rectangle (SwirlAI style section borders)."""
+    _draw_dashed_outline(draw, bbox, hex_to_rgb(color), width, dash, gap, radius)
 
 
 def draw_section_box(
@@ -178,8 +283,12 @@ def draw_section_box(
     text_color: str = "#1565C0",
     dashed: bool = True,
     border_width: int = 2,
+    img: Image.Image | None = None,
 ) -> None:
-    """Draw a labeled section box with optional dashed border (SwirlAI style)."""
+    """Draw a labeled section box with optional dashed border (SwirlAI style).
+
+    Pass ``img`` to paste the dashed border from a cached mask.
+    """
     x0, y0, x1, y1 = bbox
 
     # Fill background
@@ -187,7 +296,9 @@ def draw_section_box(
     draw.rounded_rectangle(bbox, radius=10, fill=fill_rgb)
 
     # Border
-    if dashed:
+    if dashed and img is not None:
+        paste_dashed_rect(img, bbox, border_color, border_width, dash=10, gap=6, radius=10)
+    elif dashed:
         draw_dashed_rect(draw, bbox, border_color, border_width, dash=10, gap=6, radius=10)
     else:
         draw.rounded_rectangle(bbox, radius=10, outline=hex_to_rgb(border_color), width=border_width)
@@ -214,6 +325,46 @@ def draw_section_box(
     )
 
 
+@lru_cache(maxsize=256)
+def _number_sprite(
+    number: int,
+    radius: int,
+    bg_color: str,
+    border_color: str | None,
+    text_color: str,
+    font_size: int,
+) -> tuple[Image.Image, tuple[int, int]]:
+    """Render a numbered circle once as an RGBA sprite.
+
+    Returns the sprite and the offset of its top-left corner from the circle
+    center; the sprite also covers any part of the number spilling outside.
+    """
+    num_font = get_font(font_size, "bold")
+    num_text = str(number)
+    probe = ImageDraw.Draw(Image.new("L", (1, 1)))
+    nw, nh = text_size(probe, num_text, num_font)
+    tx, ty = -(nw // 2), -(nh // 2)
+    tb = probe.textbbox((tx, ty), num_text, font=num_font)
+    left, top = min(-radius, tb[0]), min(-radius, tb[1])
+    right, bottom = max(radius + 1, tb[2]), max(radius + 1, tb[3])
+
+    sprite = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    sd = ImageDraw.Draw(sprite)
+    cx, cy = -left, -top
+    circle = (cx - radius, cy - radius, cx + radius, cy + radius)
+    if border_color:
+        sd.ellipse(circle, fill=hex_to_rgb(bg_color), outline=hex_to_rgb(border_color), width=2)
+    else:
+        sd.ellipse(circle, fill=hex_to_rgb(bg_color))
+    sd.text((cx + tx, cy + ty), num_text, fill=hex_to_rgb(text_color), font=num_font)
+    return sprite, (left, top)
+
+
+def _paste_number(img: Image.Image, center: tuple[int, int], sprite_args: tuple) -> None:
+    sprite, (dx, dy) = _number_sprite(*sprite_args)
+    img.paste(sprite, (center[0] + dx, center[1] + dy), sprite)
+
+
 def draw_step_number(
     draw: ImageDraw.Draw,
     center: tuple[int, int],
@@ -222,8 +373,15 @@ def draw_step_number(
     border_color: str = "#2B7DE9",
     text_color: str = "#2B7DE9",
     radius: int = 16,
+    img: Image.Image | None = None,
 ) -> None:
-    """Draw a circled step number like ①②③."""
+    """Draw a circled step number like ①②③.
+
+    Pass ``img`` to paste the badge from a cached sprite.
+    """
+    if img is not None:
+        _paste_number(img, center, (number, radius, bg_color, border_color, text_color, 14))
+        return
     cx, cy = center
     # Circle with border
     draw.ellipse(
@@ -251,17 +409,71 @@ def draw_outer_border(
     color: str = "#2B7DE9",
     margin: int = 12,
     border_width: int = 2,
+    img: Image.Image | None = None,
 ) -> None:
-    """Draw a dashed outer border around the entire infographic (SwirlAI style)."""
-    draw_dashed_rect(
-        draw,
-        (margin, margin, width - margin, height - margin),
-        color,
-        border_width,
-        dash=12,
-        gap=8,
-        radius=12,
-    )
+    """Draw a dashed outer border around the entire infographic (SwirlAI style).
+
+    Pass ``img`` to paste the border from a cached mask; it is identical
+    for every render of the same size.
+    """
+    bbox = (margin, margin, width - margin, height - margin)
+    if img is not None:
+        paste_dashed_rect(img, bbox, color, border_width, dash=12, gap=8, radius=12)
+    else:
+        draw_dashed_rect(draw, bbox, color, border_width, dash=12, gap=8, radius=12)
+
+
+def _fit_label(
+    draw: ImageDraw.Draw,
+    label: str,
+    max_w: int,
+    max_size: int,
+    min_size: int = 10,
+    weight: str = "bold",
+) -> tuple[ImageFont.FreeTypeFont, str]:
+    """Pick the largest font size that fits ``label``, truncating with ".." if none does.
+
+    Text width scales roughly linearly with font size, so one measurement
+    at ``max_size`` gives a size estimate that is then verified, instead of
+    measuring every candidate size and every truncated prefix.
+    """
+    font = get_font(max_size, weight)
+    lw, _ = text_size(draw, label, font)
+    if lw <= max_w:
+        return font, label
+
+    fs = max(min_size, min(max_size - 1, max_size * max_w // max(lw, 1)))
+    font = get_font(fs, weight)
+    lw, _ = text_size(draw, label, font)
+    if lw <= max_w:
+        while fs + 1 < max_size:  # the estimate may undershoot
+            bigger = get_font(fs + 1, weight)
+            bw, _ = text_size(draw, label, bigger)
+            if bw > max_w:
+                break
+            fs, font = fs + 1, bigger
+        return font, label
+    while lw > max_w and fs > min_size:
+        fs -= 1
+        font = get_font(fs, weight)
+        lw, _ = text_size(draw, label, font)
+    if lw <= max_w:
+        return font, label
+
+    # Still too wide at the smallest size: cut proportionally, then adjust
+    dots_w, _ = text_size(draw, "..", font)
+    keep = max(3, len(label) * (max_w - dots_w) // lw)
+    display = label[:keep]
+    lw, _ = text_size(draw, display + "..", font)
+    while lw > max_w and len(display) > 3:
+        display = display[:-1]
+        lw, _ = text_size(draw, display + "..", font)
+    while len(display) < len(label):  # the estimate may undershoot
+        lw, _ = text_size(draw, label[: len(display) + 1] + "..", font)
+        if lw > max_w:
+            break
+        display = label[: len(display) + 1]
+    return font, display + ".."
 
 
 def draw_node_with_header(
@@ -301,42 +513,29 @@ def draw_node_with_header(
         )
         return
 
+    fill_rgb = hex_to_rgb(fill_color)
+    border_rgb = hex_to_rgb(border_color)
+    header_rgb = hex_to_rgb(header_bg)
+    white_rgb = hex_to_rgb("#FFFFFF")
+
     # Main card with border
-    draw.rounded_rectangle(bbox, radius=radius, fill=hex_to_rgb(fill_color), outline=hex_to_rgb(border_color), width=2)
+    draw.rounded_rectangle(bbox, radius=radius, fill=fill_rgb, outline=border_rgb, width=2)
 
-    # Colored header band (top)
+    # Colored header band (top), rounded on top only
     header_box = (x0 + 1, y0 + 1, x1 - 1, y0 + header_h)
     draw.rounded_rectangle(
-        header_box, radius=radius, fill=hex_to_rgb(header_bg),
-    )
-    # Flatten the bottom corners of the header
-    draw.rectangle(
-        (x0 + 1, y0 + header_h - radius, x1 - 1, y0 + header_h),
-        fill=hex_to_rgb(header_bg),
+        header_box, radius=radius, fill=header_rgb, corners=(True, True, False, False),
     )
 
-    # Header label — adaptive font: try largest that fits, then truncate
+    # Header label — adaptive font: largest that fits, then truncate
     max_label_w = w - 16
-    label_font = get_font(10, "bold")  # fallback
-    for fs in range(min(15, max(11, h // 6)), 9, -1):
-        label_font = get_font(fs, "bold")
-        lw, lh = text_size(draw, label, label_font)
-        if lw <= max_label_w:
-            break
-
-    display_label = label
+    label_font, display_label = _fit_label(draw, label, max_label_w, min(15, max(11, h // 6)))
     lw, lh = text_size(draw, display_label, label_font)
-    if lw > max_label_w:
-        while lw > max_label_w and len(display_label) > 3:
-            display_label = display_label[:-1]
-            lw, lh = text_size(draw, display_label + "..", label_font)
-        display_label += ".."
-        lw, lh = text_size(draw, display_label, label_font)
 
     draw.text(
         (cx - lw // 2, y0 + (header_h - lh) // 2),
         display_label,
-        fill=hex_to_rgb("#FFFFFF"),
+        fill=white_rgb,
         font=label_font,
     )
 
@@ -352,23 +551,25 @@ def draw_node_with_header(
         paste_icon(img, icon_name, (cx, content_y + icon_size // 2), icon_size, accent_color)
         content_y += icon_size + 3
 
-    # Description — dynamic max_lines based on remaining space
-    if description and body_h > 20:
-        remaining_h = (y1 - 6) - content_y
-        desc_fs = min(11, max(9, h // 10))
-        desc_font = get_font(desc_fs, "regular")
-        line_h = int(desc_fs * 1.35)
-        available_lines = max(1, remaining_h // line_h)
-        draw_text_block(
-            draw, description,
-            (x0 + 7, content_y),
-            desc_font,
-            hex_to_rgb(text_muted_color),
-            body_w,
-            line_height=line_h,
-            max_lines=available_lines,
-            align="center",
-        )
+    # Description — dynamic max_lines based on remaining space, skipped
+    # outright for cramped bodies where not even one line fits
+    if not description or not description.strip() or body_h <= 20 or body_w < 40:
+        return
+    remaining_h = (y1 - 6) - content_y
+    desc_fs = min(11, max(9, h // 10))
+    line_h = int(desc_fs * 1.35)
+    if remaining_h < line_h:
+        return
+    draw_text_block(
+        draw, description,
+        (x0 + 7, content_y),
+        get_font(desc_fs, "regular"),
+        hex_to_rgb(text_muted_color),
+        body_w,
+        line_height=line_h,
+        max_lines=remaining_h // line_h,
+        align="center",
+    )
 
 
 def draw_numbered_badge(
@@ -379,28 +580,34 @@ def draw_numbered_badge(
     bg_color: str = "#5B8DEF",
     text_color: str = "#FFFFFF",
     size: int = 22,
+    img: Image.Image | None = None,
 ) -> None:
     """Draw a numbered circle badge with optional label (guidebook style).
 
     Like: (1) Encode  or  (3) Similarity search
+
+    Pass ``img`` to paste the circle from a cached sprite.
     """
     cx, cy = position
     r = size // 2
 
     # Circle with number
-    draw.ellipse(
-        (cx - r, cy - r, cx + r, cy + r),
-        fill=hex_to_rgb(bg_color),
-    )
-    num_font = get_font(max(10, size // 2), "bold")
-    num_text = str(number)
-    nw, nh = text_size(draw, num_text, num_font)
-    draw.text(
-        (cx - nw // 2, cy - nh // 2),
-        num_text,
-        fill=hex_to_rgb(text_color),
-        font=num_font,
-    )
+    if img is not None:
+        _paste_number(img, position, (number, r, bg_color, None, text_color, max(10, size // 2)))
+    else:
+        draw.ellipse(
+            (cx - r, cy - r, cx + r, cy + r),
+            fill=hex_to_rgb(bg_color),
+        )
+        num_font = get_font(max(10, size // 2), "bold")
+        num_text = str(number)
+        nw, nh = text_size(draw, num_text, num_font)
+        draw.text(
+            (cx - nw // 2, cy - nh // 2),
+            num_text,
+            fill=hex_to_rgb(text_color),
+            font=num_font,
+        )
 
     # Optional label text next to the badge
     if label:
@@ -450,18 +657,15 @@ def draw_node(
     else:
         draw_rounded_rect(draw, bbox, 10, fill_color, border_color, 2)
 
-    # Draw accent bar on top
+    # Draw accent bar on top (rounded top corners, flat bottom)
     if shape in ("rounded_rect", "rectangle"):
-        accent_h = 3
+        # Clamp the radius to the bar; Pillow 10.2 doesn't with partial corners
+        bar_h = 4
         draw.rounded_rectangle(
-            (x0 + 1, y0 + 1, x1 - 1, y0 + accent_h + 6),
-            radius=10,
+            (x0 + 1, y0 + 1, x1 - 1, y0 + 1 + bar_h),
+            radius=min(10, bar_h // 2),
             fill=hex_to_rgb(accent_color),
-        )
-        # Redraw bottom of accent to be flat
-        draw.rectangle(
-            (x0 + 1, y0 + 6, x1 - 1, y0 + accent_h + 6),
-            fill=hex_to_rgb(fill_color),
+            corners=(True, True, False, False),
         )
 
     # Layout content vertically inside the node
@@ -546,7 +750,7 @@ def draw_zone_group(
 
     # Dashed border
     if dashed:
-        draw_dashed_rect(draw, bbox, border_color, width=2, dash=10, gap=6, radius=corner_radius)
+        paste_dashed_rect(img, bbox, border_color, width=2, dash=10, gap=6, radius=corner_radius)
     else:
         draw.rounded_rectangle(bbox, radius=corner_radius, outline=hex_to_rgb(border_color), width=2)
 
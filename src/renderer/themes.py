@@ -1,5 +1,10 @@
 """Color themes for the pro rendering engine."""
 
+from functools import lru_cache
+
+# Render quality levels accepted by ProRenderer; "draft" is for previews
+QUALITY_LEVELS = ("normal", "draft")
+
 THEMES = {
     "tech_blue": {
         "name": "Tech Blue",
@@ -190,11 +195,13 @@ THEMES = {
 }
 
 
+@lru_cache(maxsize=512)
 def hex_to_rgb(hex_color: str) -> tuple[int, int, int]:
     h = hex_color.lstrip("#")
     return tuple(int(h[i : i + 2], 16) for i in (0, 2, 4))
 
 
+@lru_cache(maxsize=512)
 def hex_to_rgba(hex_color: str, alpha: int = 255) -> tuple[int, int, int, int]:
     r, g, b = hex_to_rgb(hex_color)
     return (r, g, b, alpha)
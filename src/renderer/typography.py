@@ -37,7 +37,7 @@ SYSTEM_FONTS = {
 }
 
 
-@lru_cache(maxsize=64)
+@lru_cache(maxsize=256)
 def get_font(size: int, weight: str = "regular") -> ImageFont.FreeTypeFont:
     """Load a font with caching. Falls back through system fonts."""
     paths = SYSTEM_FONTS.get(weight, SYSTEM_FONTS["regular"])
@@ -87,6 +87,8 @@ def draw_text_block(
     align: str = "left",
 ) -> int:
     """Draw wrapped text and return the total height used."""
+    if max_lines <= 0 or max_width <= 0 or not text:
+        return 0
     if not line_height:
         line_height = int(font.size * 1.4)
 
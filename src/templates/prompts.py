@@ -117,34 +117,61 @@ Style Requirements:
 - Professional comparison layout
 """
 
+_TEMPLATES = {
+    "infographic": INFOGRAPHIC_TEMPLATE,
+    "diagram": DIAGRAM_TEMPLATE,
+    "flowchart": FLOWCHART_TEMPLATE,
+    "ai_engineering": AI_ENGINEERING_TEMPLATE,
+    "rag_pipeline": RAG_PIPELINE_TEMPLATE,
+    "multi_agent": MULTI_AGENT_TEMPLATE,
+    "comparison": COMPARISON_TEMPLATE,
+}
+
+
+def _compile_template(template: str):
+    """Split a template around {topic} and {points} once.
+
+    Filling the result is plain concatenation, with no format-spec parsing.
+    """
+    head, rest = template.split("{topic}")
+    middle, tail = rest.split("{points}")
+
+    def fill(topic: str, points: str) -> str:
+        return head + topic + middle + points + tail
+
+    return fill
+
+
+_BUILDERS = {style: _compile_template(t) for style, t in _TEMPLATES.items()}
+
+_BULLET = "- "
+_BULLET_SEP = "\n" + _BULLET
+
+# Keywords that switch a generic infographic to the AI engineering template
+_AI_KEYWORDS = (
+    "llm", "rag", "agent", "embedding", "fine-tun", "finetun",
+    "transformer", "prompt engineering", "vector database", "mcp",
+    "multi-agent", "react pattern", "context engineering",
+    "guardrails", "lora", "rlhf", "grpo", "chunking",
+)
+
 
 def build_prompt(description: str, style: str = "infographic") -> str:
     """Build a detailed prompt from a user description."""
-    lines = [l.strip() for l in description.strip().split("\n") if l.strip()]
+    # One pass over the text: strip each line once, drop blanks
+    lines = []
+    for raw in description.split("\n"):
+        line = raw.strip()
+        if line:
+            lines.append(line)
     topic = lines[0] if lines else description
-    points = "\n".join(f"- {l}" for l in lines[1:]) if len(lines) > 1 else f"- {topic}"
-
-    templates = {
-        "infographic": INFOGRAPHIC_TEMPLATE,
-        "diagram": DIAGRAM_TEMPLATE,
-        "flowchart": FLOWCHART_TEMPLATE,
-        "ai_engineering": AI_ENGINEERING_TEMPLATE,
-        "rag_pipeline": RAG_PIPELINE_TEMPLATE,
-        "multi_agent": MULTI_AGENT_TEMPLATE,
-        "comparison": COMPARISON_TEMPLATE,
-    }
+    rest = lines[1:]
+    points = _BULLET + _BULLET_SEP.join(rest) if rest else _BULLET + topic
 
     # Auto-detect AI engineering content
     if style == "infographic":
         lower_desc = description.lower()
-        ai_keywords = [
-            "llm", "rag", "agent", "embedding", "fine-tun", "finetun",
-            "transformer", "prompt engineering", "vector database", "mcp",
-            "multi-agent", "react pattern", "context engineering",
-            "guardrails", "lora", "rlhf", "grpo", "chunking",
-        ]
-        if any(kw in lower_desc for kw in ai_keywords):
+        if any(kw in lower_desc for kw in _AI_KEYWORDS):
             style = "ai_engineering"
 
-    template = templates.get(style, INFOGRAPHIC_TEMPLATE)
-    return template.format(topic=topic, points=points)
+    return _BUILDERS.get(style, _BUILDERS["infographic"])(topic, points)
@@ -1,20 +1,37 @@
-"""Test all 9 renderers × 3 themes with varying content lengths."""
+"""Test all 9 renderers × 3 themes with varying content lengths.
+
+Run directly (``python test_all_renderers.py [--force]``) for the pooled
+sweep, or under pytest, where every combination is its own test case
+(``pytest -n auto test_all_renderers.py`` with pytest-xdist).
+"""
+import argparse
+import hashlib
+import os
+import shutil
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
+
+ROOT = Path(__file__).parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
 from src.models.infographic import (
     InfographicData, InfographicType, Node, Connection,
     ConnectionStyle, Layer, NodeShape, IconName,
 )
-from src.renderer.engine import ProRenderer
+from src.renderer.engine import ProRenderer, RendererError
 from src.renderer.themes import get_theme
 
 W, H = 1400, 900
+TRACEBACK_FRAMES = 3
+# Test artifacts favour encode speed over file size (~35% faster than level 6)
+PNG_COMPRESS_LEVEL = 1
 
-# ==== HELPER: create test data for each type ====
+# ==== HELPER: build test data for each type ====
 
-def make_process_data():
+def _build_process_data():
     nodes = [
         Node(id="p1", label="Data Collection", icon=IconName.DATABASE,
              description="Gather raw data from multiple sources including APIs, databases, web scraping, and manual uploads. Validate quality."),
@@ -36,7 +53,7 @@ def make_process_data():
         nodes=nodes, connections=[],
     )
 
-def make_pipeline_data():
+def _build_pipeline_data():
     nodes = [
         Node(id="s1", label="Ingestion", icon=IconName.DATABASE,
              description="Collect documents from various sources: PDFs, web pages, databases."),
@@ -59,7 +76,7 @@ def make_pipeline_data():
         ],
     )
 
-def make_architecture_data():
+def _build_architecture_data():
     nodes = [
         Node(id="ui", label="Web UI", icon=IconName.USER, description="React frontend with real-time updates"),
         Node(id="api", label="API Gateway", icon=IconName.API, description="FastAPI with rate limiting and auth middleware"),
@@ -86,7 +103,7 @@ def make_architecture_data():
         layers=layers,
     )
 
-def make_comparison_data():
+def _build_comparison_data():
     nodes = [
         Node(id="c1", label="Supervised Learning", group="Traditional ML", icon=IconName.BRAIN,
              description="Learn from labeled training data with explicit input-output mappings"),
@@ -108,7 +125,7 @@ def make_comparison_data():
         nodes=nodes, connections=[],
     )
 
-def make_concept_map_data():
+def _build_concept_map_data():
     nodes = [
         Node(id="center", label="Transformer", icon=IconName.TRANSFORMER,
              description="Self-attention based neural architecture"),
@@ -137,7 +154,7 @@ def make_concept_map_data():
         ],
     )
 
-def make_flowchart_data():
+def _build_flowchart_data():
     nodes = [
         Node(id="f1", label="User Query", icon=IconName.USER,
              description="Natural language question from the user about any topic"),
@@ -163,7 +180,7 @@ def make_flowchart_data():
         ],
     )
 
-def make_multi_agent_data():
+def _build_multi_agent_data():
     nodes = [
         Node(id="orch", label="Orchestrator", icon=IconName.BRAIN,
              description="Central coordinator routing tasks to specialized agents"),
@@ -189,7 +206,7 @@ def make_multi_agent_data():
         ],
     )
 
-def make_infographic_data():
+def _build_infographic_data():
     nodes = [
         Node(id="i1", label="GPT-4", icon=IconName.BRAIN,
              description="OpenAI's flagship large language model with multimodal inputs and 1.7T parameters"),
@@ -211,7 +228,7 @@ def make_infographic_data():
         nodes=nodes, connections=[],
     )
 
-def make_rag_pipeline_data():
+def _build_rag_pipeline_data():
     nodes = [
         Node(id="r1", label="Documents", icon=IconName.DOCUMENT,
              description="Source documents: PDFs, web pages, Markdown files, and structured data"),
@@ -241,7 +258,7 @@ def make_rag_pipeline_data():
     )
 
 
-def make_zone_rag_data():
+def _build_zone_rag_data():
     """Test with zones and curved arrows (new viral features)."""
     nodes = [
         Node(id="user", label="User", icon=IconName.USER,
@@ -296,45 +313,197 @@ def make_zone_rag_data():
 
 # ==== RUN TESTS ====
 
-themes = ["guidebook", "whiteboard", "dark_modern"]
-
-test_cases = [
-    ("process", make_process_data),
-    ("pipeline", make_pipeline_data),
-    ("architecture", make_architecture_data),
-    ("comparison", make_comparison_data),
-    ("concept_map", make_concept_map_data),
-    ("flowchart", make_flowchart_data),
-    ("multi_agent", make_multi_agent_data),
-    ("infographic", make_infographic_data),
-    ("rag_pipeline", make_rag_pipeline_data),
-    ("zone_rag", make_zone_rag_data),
+themes = ("guidebook", "whiteboard", "dark_modern")
+
+test_cases = (
+    ("process", _build_process_data),
+    ("pipeline", _build_pipeline_data),
+    ("architecture", _build_architecture_data),
+    ("comparison", _build_comparison_data),
+    ("concept_map", _build_concept_map_data),
+    ("flowchart", _build_flowchart_data),
+    ("multi_agent", _build_multi_agent_data),
+    ("infographic", _build_infographic_data),
+    ("rag_pipeline", _build_rag_pipeline_data),
+    ("zone_rag", _build_zone_rag_data),
+)
+
+# Every fixture is built (and validated) once, at import; pool workers
+# inherit the instances and renderers only read them
+_DATASETS: dict[str, InfographicData] = {name: build() for name, build in test_cases}
+
+# Cases also swept with quality="draft", for renderers that have a draft mode
+draft_cases = ("rag_pipeline",)
+
+# (case, theme, quality) in report order: the full normal matrix, then drafts
+matrix = [
+    *((name, t, "normal") for name, _ in test_cases for t in themes),
+    *((name, t, "draft") for name in draft_cases for t in themes),
 ]
 
-errors = []
-successes = []
-
-for name, make_data in test_cases:
-    for theme_name in themes:
-        data = make_data()
-        try:
-            renderer = ProRenderer(theme_name=theme_name)
-            out_path = f"output/test_{name}_{theme_name}.png"
-            path = renderer.render(data, width=W, height=H, output_path=out_path)
-            print(f"  ✅ {name} × {theme_name} → {path}")
-            successes.append(f"{name}_{theme_name}")
-        except Exception as e:
-            import traceback
-            print(f"  ❌ {name} × {theme_name} → {e}")
-            traceback.print_exc()
-            errors.append(f"{name}_{theme_name}: {e}")
-
-print(f"\n{'='*60}")
-print(f"Results: {len(successes)} passed, {len(errors)} failed")
-if errors:
-    print("\nFailed:")
-    for e in errors:
-        print(f"  ❌ {e}")
-else:
-    total = len(test_cases) * len(themes)
-    print(f"All {total} renderer combinations working correctly!")
+OUTPUT_DIR = Path("output")
+out_paths = {
+    (name, t, q): str(OUTPUT_DIR / f"test_{name}_{t}{'' if q == 'normal' else '_' + q}.png")
+    for name, t, q in matrix
+}
+# Rendered PNGs keyed by a hash of their inputs; delete to invalidate
+CACHE_DIR = OUTPUT_DIR / ".cache"
+
+
+def _source_files() -> list[Path]:
+    """Everything that affects the rendered output."""
+    return sorted([
+        Path(__file__),
+        *(ROOT / "src" / "renderer").rglob("*.py"),
+        *(ROOT / "src" / "models").rglob("*.py"),
+        # Icon SVGs are rasterized into the nodes
+        *(p for p in (ROOT / "assets").rglob("*") if p.is_file()),
+    ])
+
+
+def _source_mtime() -> float:
+    """Newest modification time of the sources."""
+    return max(p.stat().st_mtime for p in _source_files())
+
+
+def _source_digest() -> str:
+    """Hash of the sources' names and contents, so a renamed icon counts too."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in _source_files():
+        h.update(p.relative_to(ROOT).as_posix().encode() + b"\0")
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+def _cache_path(name: str, theme_name: str, quality: str, src_digest: str) -> Path:
+    """Cache file for one combination: fixture, theme, quality, size and source code."""
+    payload = repr((_DATASETS[name].model_dump(), theme_name, quality, W, H, src_digest))
+    return CACHE_DIR / f"{hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()}.png"
+
+
+def _label(job: tuple[str, str, str]) -> str:
+    name, theme_name, quality = job
+    return f"{name} × {theme_name}" + ("" if quality == "normal" else f" ({quality})")
+
+
+def _is_fresh(path: str, src_mtime: float) -> bool:
+    try:
+        return os.path.getmtime(path) > src_mtime
+    except OSError:
+        return False
+
+
+# ProRenderer only holds its theme, so one instance per theme is reused
+renderers = {t: ProRenderer(theme_name=t) for t in themes}
+render_funcs = {t: r.render_to_bytes for t, r in renderers.items()}
+
+
+def _run_one(job: tuple[str, str, str]):
+    """Render one (case, theme, quality) combination in a worker process.
+
+    Returns (job, png_bytes, error, traceback_text); the data is looked up
+    by name so only three short strings cross the pool. The PNG is encoded
+    here and written by the parent, so file creation happens in one place
+    instead of racing across workers.
+    """
+    name, theme_name, quality = job
+    data = _DATASETS[name]
+    try:
+        png = render_funcs[theme_name](data, W, H, PNG_COMPRESS_LEVEL, quality=quality)
+        return job, png, None, None
+    except (RendererError, ValueError, OSError) as e:
+        # Only the innermost frames of the underlying failure are worth logging
+        cause = e.__cause__ or e
+        tb = "".join(traceback.format_exception(cause, limit=-TRACEBACK_FRAMES, chain=False))
+        return job, None, e, tb
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize test_render over the full case × theme × quality matrix."""
+    if {"name", "theme_name", "quality"} <= set(metafunc.fixturenames):
+        metafunc.parametrize(("name", "theme_name", "quality"), matrix)
+
+
+def test_render(name: str, theme_name: str, quality: str) -> None:
+    _, png, e, tb = _run_one((name, theme_name, quality))
+    assert e is None, tb
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    path = Path(out_paths[name, theme_name, quality])
+    path.write_bytes(png)
+    assert path.stat().st_size > 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-render every combination, ignoring up-to-date outputs and the cache.",
+    )
+    parser.add_argument(
+        "--threads", action="store_true",
+        help="Experimental: use a thread pool instead of processes. Drawing and text "
+             "rendering hold the GIL, so expect no speedup unless profiling shows one.",
+    )
+    args = parser.parse_args()
+
+    errors = []
+    successes = []
+    tracebacks = []
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    CACHE_DIR.mkdir(exist_ok=True)
+
+    # Outputs newer than every renderer/model source are still valid, and
+    # a combination whose inputs were rendered before is copied from cache
+    src_mtime = _source_mtime()
+    src_digest = _source_digest()
+    cache_paths = {}
+    pending = []
+    for job in matrix:
+        out_path = out_paths[job]
+        cached = cache_paths[job] = _cache_path(*job, src_digest)
+        if not args.force and _is_fresh(out_path, src_mtime):
+            print(f"  ⏭️  {_label(job)} → up to date")
+            successes.append(job)
+        elif not args.force and cached.exists():
+            shutil.copyfile(cached, out_path)
+            print(f"  ⏭️  {_label(job)} → {out_path} (cached)")
+            successes.append(job)
+        else:
+            pending.append(job)
+
+    # Entries for older sources (or removed fixtures) can never hit again
+    live = set(cache_paths.values())
+    for stale in CACHE_DIR.glob("*.png"):
+        if stale not in live:
+            stale.unlink()
+
+    executor_cls = ThreadPoolExecutor if args.threads else ProcessPoolExecutor
+    with executor_cls(max_workers=os.cpu_count()) as ex:
+        # map keeps results in matrix order, so the report is stable run to run
+        for job, png, e, tb in ex.map(_run_one, pending):
+            if e is None:
+                path = Path(out_paths[job])
+                path.write_bytes(png)
+                cache_paths[job].write_bytes(png)
+                print(f"  ✅ {_label(job)} → {path}")
+                successes.append(job)
+            else:
+                print(f"  ❌ {_label(job)} → {e}")
+                errors.append((job, e))
+                tracebacks.append(tb)
+
+    print(f"\n{'='*60}")
+    print(f"Results: {len(successes)} passed, {len(errors)} failed")
+    if errors:
+        # Tracebacks are printed together once the sweep is done
+        for tb in tracebacks:
+            print(tb, end="", file=sys.stderr)
+        print("\nFailed:")
+        for job, e in errors:
+            print(f"  ❌ {_label(job)}: {e}")
+    else:
+        print(f"All {len(matrix)} renderer combinations working correctly!")
+
+
+if __name__ == "__main__":
+    main()